@@ -1,6 +1,18 @@
 import csv
+import sys
+import json
+import math
+import os
+import queue
+import sqlite3
+import uuid
+from contextlib import contextmanager
+import heapq
+import asyncio
+import time as timer
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set, Iterator, AsyncIterator
 from collections import defaultdict
 import random
 import numpy as np
@@ -16,6 +28,10 @@ DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
 MAX_CONSECUTIVE_CLASSES = 2  # Maximum preferred consecutive classes per day
 IDEAL_GAP = timedelta(hours=1)  # 1 hour gap is ideal
 MAX_GAP = timedelta(hours=2)  # More than 2 hours gap is not preferred
+STREAK_GAP = timedelta(minutes=15)  # Classes this close together count as back-to-back
+MINUTES_PER_DAY = 24 * 60
+BUDGET_LOG = "budget_log.csv"  # predicted vs actual scheduler timings
+SOLUTION_LIBRARY = "solution_library.json"  # past solutions for warm starts
 
 
 @dataclass
@@ -99,6 +115,11 @@ def group_classes_by_section(classes: List[Class]) -> Dict[str, Dict[str, List[C
     return section_groups
 
 
+def time_to_minutes(t: time) -> int:
+    """Convert a time of day to minutes since midnight for fast comparisons"""
+    return t.hour * 60 + t.minute
+
+
 @dataclass
 class ScheduledClass:
     class_obj: Class
@@ -197,6 +218,25 @@ class Timetable:
 
         return total_gap_score / (len(day_classes) - 1) if len(day_classes) > 1 else 1.0
 
+    def get_day_streaks(self, day: str) -> List[int]:
+        """Lengths of the runs of back-to-back classes on a single day"""
+        day_classes = self.schedule[day]
+        if not day_classes:
+            return []
+
+        streaks = []
+        consecutive_streak = 1
+        for i in range(1, len(day_classes)):
+            prev_end_dt = datetime.combine(datetime.today(), day_classes[i - 1].end_time)
+            curr_start_dt = datetime.combine(datetime.today(), day_classes[i].start_time)
+            if (curr_start_dt - prev_end_dt) <= STREAK_GAP:
+                consecutive_streak += 1
+            else:
+                streaks.append(consecutive_streak)
+                consecutive_streak = 1
+        streaks.append(consecutive_streak)
+        return streaks
+
     def get_scheduled_courses(self) -> Set[str]:
         return {sc.class_obj.course for sc in self.scheduled_classes}
 
@@ -227,6 +267,249 @@ class Timetable:
         return True
 
 
+def _longest_day_streak(mask: int) -> int:
+    """Longest run of consecutive days in a bitmask over DAYS"""
+    longest = current = 0
+    for i in range(len(DAYS)):
+        if mask & (1 << i):
+            current += 1
+            longest = max(longest, current)
+        else:
+            current = 0
+    return longest
+
+
+LONGEST_STREAK_BY_MASK = [_longest_day_streak(m) for m in range(1 << len(DAYS))]
+DAY_BIT = {day: 1 << i for i, day in enumerate(DAYS)}
+
+
+class IncrementalTimetable(Timetable):
+    """Timetable that keeps each day sorted and caches its aggregates.
+
+    Each day holds (start, end, seq) minute keys parallel to its schedule
+    list, so a slot is found by bisect instead of re-sorting after every
+    insert. Utilized days are a bitmask, and gap scores and streaks are
+    cached per day and only recomputed for days that changed. Sections can
+    be removed again, so local search and repair can edit in place.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._keys = {day: [] for day in DAYS}
+        self._max_duration = {day: 0 for day in DAYS}
+        self._seq = 0
+        self._day_mask = 0
+        self._gap_scores = {}
+        self._streaks = {}
+
+    def can_add_section(self, section_classes: List[Class]) -> bool:
+        """Check if we can add all classes in this section without clashes."""
+        for cls in section_classes:
+            start = time_to_minutes(cls.start_time)
+            end = time_to_minutes(cls.end_time)
+            keys = self._keys[cls.days]
+            # Nothing starting before start - longest class can still be running
+            i = bisect_left(keys, (start - self._max_duration[cls.days],))
+            while i < len(keys) and keys[i][0] < end:
+                if keys[i][1] > start:
+                    return False
+                i += 1
+        return True
+
+    def _touch(self, day: str):
+        self._gap_scores.pop(day, None)
+        self._streaks.pop(day, None)
+        if self.schedule[day]:
+            self._day_mask |= DAY_BIT[day]
+        else:
+            self._day_mask &= ~DAY_BIT[day]
+
+    def add_section(self, section_classes: List[Class]):
+        """Add all classes in a section. Assumes can_add_section was checked."""
+        for cls in section_classes:
+            day = cls.days
+            start = time_to_minutes(cls.start_time)
+            end = time_to_minutes(cls.end_time)
+            key = (start, end, self._seq)
+            self._seq += 1
+            pos = bisect_right(self._keys[day], key)
+            self._keys[day].insert(pos, key)
+            sc = ScheduledClass(
+                class_obj=cls,
+                day=day,
+                start_time=cls.start_time,
+                end_time=cls.end_time,
+            )
+            self.schedule[day].insert(pos, sc)
+            self.scheduled_classes.append(sc)
+            self._max_duration[day] = max(self._max_duration[day], end - start)
+            self._touch(day)
+
+    def remove_section(self, section_classes: List[Class]):
+        """Remove every class of a previously added section."""
+        for cls in section_classes:
+            day = cls.days
+            keys = self._keys[day]
+            i = bisect_left(keys, (time_to_minutes(cls.start_time),))
+            while i < len(keys) and self.schedule[day][i].class_obj is not cls:
+                i += 1
+            if i == len(keys):
+                raise ValueError(
+                    f"{cls.course} {cls.activity} {cls.section} on {day} is not scheduled"
+                )
+            del keys[i]
+            sc = self.schedule[day].pop(i)
+            for j, other in enumerate(self.scheduled_classes):
+                if other is sc:
+                    del self.scheduled_classes[j]
+                    break
+            self._touch(day)
+
+    def get_utilized_days(self) -> int:
+        return bin(self._day_mask).count("1")
+
+    def get_consecutive_days_score(self) -> float:
+        """Calculate score based on consecutive days used"""
+        return LONGEST_STREAK_BY_MASK[self._day_mask] / len(DAYS)
+
+    def get_day_gaps_score(self, day: str) -> float:
+        """Cached version of Timetable.get_day_gaps_score"""
+        if day not in self._gap_scores:
+            self._gap_scores[day] = super().get_day_gaps_score(day)
+        return self._gap_scores[day]
+
+    def get_day_streaks(self, day: str) -> List[int]:
+        """Cached version of Timetable.get_day_streaks"""
+        if day not in self._streaks:
+            self._streaks[day] = super().get_day_streaks(day)
+        return self._streaks[day]
+
+
+def print_no_timetable_found():
+    print("\n" + "=" * 50)
+    print("COULD NOT FIND A VALID, CLASH-FREE TIMETABLE")
+    print(
+        "This likely means there are unavoidable time clashes between the required sections of your chosen courses, even with all possible combinations."
+    )
+    print("Please try a different combination of courses.")
+    print("=" * 50)
+
+
+@dataclass
+class TimetableResult:
+    timetable: Timetable
+    score: float
+    generation: int
+    evaluations: int
+    elapsed: float  # seconds since the run started
+    genes: List[int]
+
+
+BUDGET_LOG_FIELDS = [
+    "engine",
+    "space_size",
+    "feasible_density",
+    "pop_size",
+    "generations",
+    "eval_cost",
+    "cost_scale",
+    "sampling_seconds",
+    "exact_limit",
+    "exact_seconds",
+    "ga_predicted_seconds",
+    "ga_actual_seconds",
+    "predicted_seconds",
+    "actual_seconds",
+    "target_seconds",
+]
+
+
+@dataclass
+class BudgetPlan:
+    engine: str  # "exact" or "ga"
+    pop_size: int
+    generations: int
+    space_size: int
+    feasible_density: float
+    eval_cost: float  # measured seconds per evaluation, before cost_scale
+    sampling_seconds: float  # time spent measuring the problem
+    exact_limit: float  # time the pruned exact search may take before the GA
+    target_seconds: float
+    cost_scale: float
+    ga_predicted_seconds: float = 0.0  # unscaled GA evaluation time
+    exact_seconds: float = 0.0
+    ga_actual_seconds: float = 0.0
+    actual_seconds: Optional[float] = None
+
+    @property
+    def predicted_seconds(self) -> float:
+        """Planned time for the whole run: sampling, the exact search up to
+        its limit and the scaled GA prediction."""
+        return (
+            self.sampling_seconds + self.exact_limit + self.ga_predicted_seconds * self.cost_scale
+        )
+
+    def append_to_log(self, path: str):
+        """Append this plan as a CSV row for later recalibration"""
+        rows = []
+        if os.path.exists(path):
+            with open(path, mode="r", encoding="utf-8") as file:
+                reader = csv.DictReader(file)
+                if reader.fieldnames != BUDGET_LOG_FIELDS:
+                    # Older log layout: rewrite it with the current columns
+                    rows = list(reader)
+        new_file = rows or not os.path.exists(path)
+        with open(path, mode="w" if new_file else "a", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=BUDGET_LOG_FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+                writer.writerows(rows)
+            writer.writerow({field: getattr(self, field) for field in BUDGET_LOG_FIELDS})
+
+
+@dataclass
+class BudgetModel:
+    cost_scale: float = 1.0  # actual / predicted correction from past runs
+    safety: float = 0.8  # plan to use this fraction of the target latency
+    # Share of offspring re-evaluated per generation. Dedup lowers the real
+    # share as the population converges, but the rows left are mostly
+    # clash-free and costlier, which on classes.csv roughly cancels out.
+    changed_fraction: float = 0.85
+    cost_samples: int = 50  # evaluations timed to estimate the per-evaluation cost
+    sparse_density: float = 0.01  # below this sampled density the GA rarely helps
+    exact_share: float = 0.25  # budget share for the exact search on dense problems
+    sparse_exact_share: float = 0.75  # ... and on sparse ones, where pruning pays off
+    min_pop: int = 30
+    max_pop: int = 500
+    min_generations: int = 5
+    max_generations: int = 150
+
+    def recalibrate(self, records: List[dict], quantile: float = 0.5):
+        """Set cost_scale so that ``quantile`` of past GA runs would have
+        had their evaluation time predicted at or above the actual time.
+        Sampling and the exact search are measured, not predicted, so only
+        the unscaled GA prediction is compared. The median is the default:
+        run_auto stops the GA at its budget, so the tail needs no margin."""
+        ratios = sorted(
+            float(r["ga_actual_seconds"]) / float(r["ga_predicted_seconds"])
+            for r in records
+            if r.get("engine") == "ga"
+            and r.get("ga_actual_seconds")
+            and float(r.get("ga_predicted_seconds") or 0) > 0
+        )
+        if ratios:
+            self.cost_scale = ratios[min(len(ratios) - 1, int(quantile * len(ratios)))]
+
+    @classmethod
+    def from_log(cls, path: str, quantile: float = 0.5) -> "BudgetModel":
+        """Model recalibrated from a log written by BudgetPlan.append_to_log"""
+        model = cls()
+        if os.path.exists(path):
+            with open(path, mode="r", encoding="utf-8") as file:
+                model.recalibrate(list(csv.DictReader(file)), quantile)
+        return model
+
+
 ### REWRITTEN CLASS ###
 class TimetableGenerator:
     def __init__(self, classes: List[Class], user_preferences: dict):
@@ -237,6 +520,13 @@ class TimetableGenerator:
         )  # Default to True
         self.section_groups = group_classes_by_section(classes)
         self.gene_map = []
+        self.gene_upper_bounds = []
+        self.evaluations = 0
+        self.logbook = None
+        self.last_run_stats = None
+        self.budget_history = []
+        self.exact_complete = True
+        self._score_cache = {}
         self.setup_deap()
 
     def setup_deap(self):
@@ -338,6 +628,7 @@ class TimetableGenerator:
             raise ValueError(
                 "No valid sections found for the selected courses with the chosen constraints."
             )
+        self.gene_upper_bounds = gene_upper_bounds
 
         self.toolbox.register(
             "indices",
@@ -362,13 +653,8 @@ class TimetableGenerator:
         )
         self.toolbox.register("select", tools.selTournament, tournsize=3)
 
-    # In tt.py, replace your existing evaluate method with this one.
-
-    def evaluate(self, individual: List[int]) -> Tuple[float,]:
-        # ### THIS IS THE METHOD TO REPLACE ###
-        timetable = Timetable()
-
-        # --- Decode the individual (your existing logic is perfect) ---
+    def decode(self, individual: List[int]) -> List[List[Class]]:
+        """Turn a genotype into the list of sections it selects."""
         sections_to_schedule = []
         if self.enforce_ties:
             gene_idx = 0
@@ -388,6 +674,12 @@ class TimetableGenerator:
         else:
             for i, map_item in enumerate(self.gene_map):
                 sections_to_schedule.append(map_item["sections"][individual[i]])
+        return sections_to_schedule
+
+    def evaluate(self, individual: List[int]) -> Tuple[float,]:
+        self.evaluations += 1
+        timetable = Timetable()
+        sections_to_schedule = self.decode(individual)
 
         # --- Check for clashes (HARD constraint) ---
         for section in sections_to_schedule:
@@ -395,6 +687,10 @@ class TimetableGenerator:
                 return (0,)
             timetable.add_section(section)
 
+        return (self.score_timetable(timetable),)
+
+    def score_timetable(self, timetable: Timetable) -> float:
+        """Score a clash-free timetable against the user's preferences."""
         # --- DYNAMIC SCORING based on user's chosen style ---
         score = 10000.0
         style = self.user_preferences.get("schedule_style", "compact")
@@ -453,114 +749,1837 @@ class TimetableGenerator:
                 continue  # Done with this day, move to the next
 
             # If we get here, the day has 2 or more classes, so we check streaks.
-            consecutive_streak = 1
-            for i in range(1, len(day_classes)):
-                prev_end_dt = datetime.combine(
-                    datetime.today(), day_classes[i - 1].end_time
+            for consecutive_streak in timetable.get_day_streaks(day):
+                if consecutive_streak == 1:
+                    score -= STREAK_PENALTY_1
+                elif consecutive_streak == 2:
+                    score += STREAK_BONUS_2
+                else:
+                    score -= (consecutive_streak - 2) * STREAK_PENALTY_3_PLUS
+
+        return score
+
+    def chosen_sections(self, individual: List[int]) -> List[Tuple[str, str, str]]:
+        """(course, activity, section) of every section a genotype selects"""
+        return [
+            (section[0].course, section[0].activity, section[0].section)
+            for section in self.decode(individual)
+        ]
+
+    def genes_from_sections(
+        self, chosen: List[Tuple[str, str, str]]
+    ) -> Tuple[List[int], int]:
+        """Map (course, activity, section) choices onto this gene_map.
+
+        Genes with no matching choice are drawn at random. Returns the genes
+        and how many of them were matched.
+        """
+        wanted = {(course, activity): section for course, activity, section in chosen}
+        genes = [random.randint(0, bound) for bound in self.gene_upper_bounds]
+        matched = 0
+        if self.enforce_ties:
+            for i, map_item in enumerate(self.gene_map):
+                lecture = wanted.get((map_item["course"], "Lecture"))
+                tutorial = wanted.get((map_item["course"], "Tutorial"))
+                for p, (lecture_section, tied_tutorials) in enumerate(map_item["pairs"]):
+                    if lecture_section[0].section != lecture:
+                        continue
+                    genes[2 * i] = p
+                    matched += 1
+                    for t, tutorial_section in enumerate(tied_tutorials):
+                        if tutorial_section[0].section == tutorial:
+                            genes[2 * i + 1] = t
+                            matched += 1
+                    break
+        else:
+            for i, map_item in enumerate(self.gene_map):
+                section = wanted.get((map_item["course"], map_item["activity"]))
+                for j, candidate in enumerate(map_item["sections"]):
+                    if candidate[0].section == section:
+                        genes[i] = j
+                        matched += 1
+                        break
+        return genes, matched
+
+    # --- Memetic local search ---
+
+    def _canonical(self, individual: List[int]) -> Tuple[int, ...]:
+        """Genotype key where tutorial genes are reduced to the choice they decode to."""
+        genes = list(individual)
+        if self.enforce_ties:
+            for gene_idx in range(0, len(genes), 2):
+                pair = self.gene_map[gene_idx // 2]["pairs"][genes[gene_idx]]
+                genes[gene_idx + 1] %= max(len(pair[1]), 1)
+        return tuple(genes)
+
+    def _cached_score(
+        self, individual: List[int], score_fn=None
+    ) -> Tuple[float, bool]:
+        """Score a genotype, reusing earlier results. Returns (score, was_evaluated)."""
+        key = self._canonical(individual)
+        if key in self._score_cache:
+            return self._score_cache[key], False
+        score = score_fn(individual) if score_fn else self.evaluate(individual)[0]
+        self._score_cache[key] = score
+        return score, True
+
+    def build_timetable(self, individual: List[int]) -> Optional[IncrementalTimetable]:
+        """Decode into an editable timetable, or None if the sections clash."""
+        timetable = IncrementalTimetable()
+        for section in self.decode(individual):
+            if not timetable.can_add_section(section):
+                return None
+            timetable.add_section(section)
+        return timetable
+
+    def score_move(
+        self,
+        timetable: IncrementalTimetable,
+        current_sections: List[List[Class]],
+        candidate: List[int],
+    ) -> float:
+        """Score a neighbour by swapping only its changed sections in the timetable.
+
+        The timetable must hold ``current_sections`` and is restored before
+        returning.
+        """
+        self.evaluations += 1
+        new_sections = self.decode(candidate)
+        changed = [
+            i
+            for i, (old, new) in enumerate(zip(current_sections, new_sections))
+            if old is not new
+        ]
+        for i in changed:
+            timetable.remove_section(current_sections[i])
+
+        added = []
+        for i in changed:
+            if not timetable.can_add_section(new_sections[i]):
+                break
+            timetable.add_section(new_sections[i])
+            added.append(i)
+        score = self.score_timetable(timetable) if len(added) == len(changed) else 0.0
+
+        for i in added:
+            timetable.remove_section(new_sections[i])
+        for i in changed:
+            timetable.add_section(current_sections[i])
+        return score
+
+    def _neighbours(self, genes: List[int]):
+        """All single-gene changes, then all changes of two genes at once."""
+        bounds = self.gene_upper_bounds
+        n_genes = len(genes)
+        for i in range(n_genes):
+            for value in range(bounds[i] + 1):
+                if value != genes[i]:
+                    yield ((i, value),)
+        for i in range(n_genes):
+            for j in range(i + 1, n_genes):
+                for value_i in range(bounds[i] + 1):
+                    if value_i == genes[i]:
+                        continue
+                    for value_j in range(bounds[j] + 1):
+                        if value_j != genes[j]:
+                            yield ((i, value_i), (j, value_j))
+
+    def local_search(
+        self, individual: List[int], max_evals: int = 2000
+    ) -> Tuple[List[int], float, int]:
+        """First-improvement hill climbing over single and paired gene changes.
+
+        While the current genotype is clash-free, neighbours are scored by
+        editing an IncrementalTimetable in place. Scores are cached per run,
+        so revisiting a genotype (or a tutorial gene that decodes to the
+        same section) costs nothing. Stops at a local optimum or after
+        ``max_evals`` fresh evaluations. Returns the improved genes, their
+        score and the evaluations spent.
+        """
+        best = list(individual)
+        best_score, evaluated = self._cached_score(best)
+        evals = int(evaluated)
+
+        improved = True
+        while improved and evals < max_evals:
+            improved = False
+            timetable = self.build_timetable(best) if best_score else None
+            if timetable is not None:
+                current_sections = self.decode(best)
+                score_fn = lambda ind: self.score_move(timetable, current_sections, ind)
+            else:
+                score_fn = None
+
+            for move in self._neighbours(best):
+                candidate = list(best)
+                for gene_idx, value in move:
+                    candidate[gene_idx] = value
+                score, evaluated = self._cached_score(candidate, score_fn)
+                evals += evaluated
+                if score > best_score:
+                    best, best_score = candidate, score
+                    improved = True
+                    break
+                if evals >= max_evals:
+                    break
+        return best, best_score, evals
+
+    def _polish(self, individual, max_evals: int) -> bool:
+        """Apply local search to an individual in place. Returns True if it improved."""
+        genes, score, _ = self.local_search(individual, max_evals)
+        if score <= individual.fitness.values[0]:
+            return False
+        individual[:] = genes
+        individual.fitness.values = (score,)
+        return True
+
+    def _evolve(
+        self,
+        pop,
+        hof,
+        stats,
+        generations: int,
+        cxpb: float = 0.8,
+        mutpb: float = 0.2,
+        polish_elites: int = 0,
+        elite_evals: int = 200,
+        verbose: bool = True,
+    ):
+        """Generational loop equivalent to algorithms.eaSimple, with optional
+        local search on the best individuals of every generation.
+
+        This is a generator: it yields the generation number after each
+        generation so callers can inspect ``pop``/``hof`` or stop early.
+        The logbook is kept on ``self.logbook``.
+        """
+        logbook = tools.Logbook()
+        logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
+        self.logbook = logbook
+
+        def evaluate_invalid(individuals) -> int:
+            invalid = [ind for ind in individuals if not ind.fitness.valid]
+            for ind, fit in zip(invalid, self.toolbox.map(self.toolbox.evaluate, invalid)):
+                ind.fitness.values = fit
+            return len(invalid)
+
+        def polish(individuals):
+            for ind in tools.selBest(individuals, polish_elites):
+                self._polish(ind, elite_evals)
+
+        nevals = evaluate_invalid(pop)
+        if polish_elites:
+            polish(pop)
+        hof.update(pop)
+        logbook.record(gen=0, nevals=nevals, **(stats.compile(pop) if stats else {}))
+        if verbose:
+            print(logbook.stream)
+        yield 0
+
+        for gen in range(1, generations + 1):
+            offspring = self.toolbox.select(pop, len(pop))
+            offspring = algorithms.varAnd(offspring, self.toolbox, cxpb, mutpb)
+            nevals = evaluate_invalid(offspring)
+            if polish_elites:
+                polish(offspring)
+            hof.update(offspring)
+            pop[:] = offspring
+            logbook.record(
+                gen=gen, nevals=nevals, **(stats.compile(pop) if stats else {})
+            )
+            if verbose:
+                print(logbook.stream)
+            yield gen
+
+    # --- Anytime streaming ---
+
+    def _stream_steps(
+        self,
+        generations: int,
+        pop_size: int,
+        polish_elites: int,
+        elite_evals: int,
+        time_limit: Optional[float],
+    ) -> Iterator[Optional["TimetableResult"]]:
+        """Run the GA one generation per step, producing a result when the best
+        improves and None otherwise."""
+        self.evaluations = 0
+        self._score_cache = {}
+        started = timer.perf_counter()
+        pop = self.toolbox.population(n=pop_size)
+        hof = tools.HallOfFame(1)
+        best_score = 0
+
+        for gen in self._evolve(
+            pop,
+            hof,
+            None,
+            generations,
+            polish_elites=polish_elites,
+            elite_evals=elite_evals,
+            verbose=False,
+        ):
+            score = hof[0].fitness.values[0]
+            if score > best_score:
+                best_score = score
+                yield TimetableResult(
+                    timetable=self.build_timetable(hof[0]),
+                    score=score,
+                    generation=gen,
+                    evaluations=self.evaluations,
+                    elapsed=timer.perf_counter() - started,
+                    genes=list(hof[0]),
                 )
-                curr_start_dt = datetime.combine(
-                    datetime.today(), day_classes[i].start_time
+            else:
+                yield None
+            if time_limit is not None and timer.perf_counter() - started >= time_limit:
+                return
+
+    def stream(
+        self,
+        generations=150,
+        pop_size=500,
+        polish_elites=0,
+        elite_evals=200,
+        time_limit: Optional[float] = None,
+    ) -> Iterator["TimetableResult"]:
+        """Yield a TimetableResult every time the best clash-free timetable improves.
+
+        The first result usually arrives after the initial population is
+        scored. Break out of the loop (or set ``time_limit`` in seconds) to
+        cancel; the last result received is the best found so far.
+        """
+        if not self.gene_map:
+            return
+        for result in self._stream_steps(
+            generations, pop_size, polish_elites, elite_evals, time_limit
+        ):
+            if result is not None:
+                yield result
+
+    async def astream(
+        self,
+        generations=150,
+        pop_size=500,
+        polish_elites=0,
+        elite_evals=200,
+        time_limit: Optional[float] = None,
+    ) -> AsyncIterator["TimetableResult"]:
+        """Async version of stream() that hands control back to the event loop
+        after every generation, so the task can be cancelled between them."""
+        if not self.gene_map:
+            return
+        for result in self._stream_steps(
+            generations, pop_size, polish_elites, elite_evals, time_limit
+        ):
+            if result is not None:
+                yield result
+            await asyncio.sleep(0)
+
+    # --- Array-native GA core ---
+
+    def _evaluate_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Evaluate each distinct genotype in ``rows`` once."""
+        unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+        scores = np.fromiter(
+            (self.evaluate(row.tolist())[0] for row in unique_rows),
+            dtype=np.float64,
+            count=len(unique_rows),
+        )
+        return scores[inverse.reshape(-1)]
+
+    def evolve_array(
+        self,
+        generations=150,
+        pop_size=500,
+        cxpb=0.8,
+        mutpb=0.2,
+        indpb=0.1,
+        tournsize=3,
+        seed: Optional[int] = None,
+        verbose=True,
+        seeds: Optional[List[List[int]]] = None,
+        time_limit: Optional[float] = None,
+    ) -> Tuple[List[int], float]:
+        """GA on a (pop_size, n_genes) integer matrix instead of DEAP individuals.
+
+        Tournament selection, uniform crossover and bounded-int mutation
+        follow the toolbox registered in setup_deap, with varAnd's pairing,
+        but each is one vectorized operation over the whole population.
+        Only rows that actually changed are re-evaluated, and duplicate rows
+        are scored once. ``seeds`` replace the first rows of the initial
+        population. With ``time_limit`` no new generation starts after that
+        many seconds. Returns the best genes and their score.
+        """
+        deadline = timer.perf_counter() + time_limit if time_limit is not None else None
+        rng = np.random.default_rng(seed)
+        bounds = np.asarray(self.gene_upper_bounds)
+        dtype = np.uint8 if bounds.max() < 256 else np.int32
+        n_genes = len(bounds)
+
+        pop = (rng.random((pop_size, n_genes)) * (bounds + 1)).astype(dtype)
+        seeds = (seeds or [])[:pop_size]
+        if seeds:
+            pop[: len(seeds)] = np.asarray(seeds, dtype=dtype)
+        start_evals = self.evaluations  # run_auto evaluates before the GA starts
+        fitness = self._evaluate_rows(pop)
+        best = int(np.argmax(fitness))
+        best_genes, best_score = pop[best].copy(), fitness[best]
+        best_gen, best_evals = 0, self.evaluations - start_evals
+        if verbose:
+            print("gen\tnevals\tavg\tmax\tmin")
+            print(f"0\t{pop_size}\t{fitness.mean():.2f}\t{fitness.max()}\t{fitness.min()}")
+
+        n_pairs = pop_size // 2
+        for gen in range(1, generations + 1):
+            if deadline is not None and timer.perf_counter() > deadline:
+                break
+            # Tournament selection
+            contestants = rng.integers(0, pop_size, size=(pop_size, tournsize))
+            winners = contestants[
+                np.arange(pop_size), np.argmax(fitness[contestants], axis=1)
+            ]
+            parents = pop[winners]
+            offspring = parents.copy()
+            fitness = fitness[winners]
+
+            # Uniform crossover on consecutive pairs
+            mating = rng.random(n_pairs) < cxpb
+            swap = (rng.random((n_pairs, n_genes)) < 0.5) & mating[:, None]
+            first = offspring[0 : 2 * n_pairs : 2]
+            second = offspring[1 : 2 * n_pairs : 2]
+            first_new = np.where(swap, second, first)
+            second_new = np.where(swap, first, second)
+            offspring[0 : 2 * n_pairs : 2] = first_new
+            offspring[1 : 2 * n_pairs : 2] = second_new
+
+            # Bounded-int mutation
+            mutating = rng.random(pop_size) < mutpb
+            flip = (rng.random((pop_size, n_genes)) < indpb) & mutating[:, None]
+            random_genes = (rng.random((pop_size, n_genes)) * (bounds + 1)).astype(dtype)
+            offspring = np.where(flip, random_genes, offspring)
+
+            changed = np.any(offspring != parents, axis=1)
+            if changed.any():
+                fitness[changed] = self._evaluate_rows(offspring[changed])
+            pop = offspring
+
+            best = int(np.argmax(fitness))
+            if fitness[best] > best_score:
+                best_genes, best_score = pop[best].copy(), fitness[best]
+                best_gen, best_evals = gen, self.evaluations - start_evals
+            if verbose:
+                print(
+                    f"{gen}\t{int(changed.sum())}\t{fitness.mean():.2f}\t{fitness.max()}\t{fitness.min()}"
                 )
 
-                if (curr_start_dt - prev_end_dt) <= timedelta(minutes=15):
-                    consecutive_streak += 1
-                else:
-                    if consecutive_streak == 1:
-                        score -= STREAK_PENALTY_1
-                    elif consecutive_streak == 2:
-                        score += STREAK_BONUS_2
-                    else:
-                        score -= (consecutive_streak - 2) * STREAK_PENALTY_3_PLUS
-                    consecutive_streak = 1
-
-            # Score the final streak of the day
-            if consecutive_streak == 1:
-                score -= STREAK_PENALTY_1
-            elif consecutive_streak == 2:
-                score += STREAK_BONUS_2
+        self.last_run_stats = {
+            "engine": "array",
+            "warm": bool(seeds),
+            "pop_size": pop_size,
+            "generations_to_best": best_gen,
+            "evaluations_to_best": best_evals,
+            "best_score": float(best_score),
+        }
+        return best_genes.tolist(), float(best_score)
+
+    def run_array(
+        self, generations=150, pop_size=500, seed: Optional[int] = None
+    ) -> Optional[Timetable]:
+        """Same contract as run(), using the array-native GA core."""
+        if not self.gene_map:
+            print(
+                "\nError: No sections available for the selected courses. Cannot generate a timetable."
+            )
+            return None
+
+        self.evaluations = 0
+        best_genes, best_score = self.evolve_array(generations, pop_size, seed=seed)
+        print(f"Total evaluations: {self.evaluations}")
+        if best_score == 0:
+            print_no_timetable_found()
+            return None
+        return self.build_timetable(best_genes)
+
+    # --- Automatic budgeting ---
+
+    def _choices(self) -> List[List[Tuple[Tuple[int, ...], List[List[Class]]]]]:
+        """Distinct (genes, sections) choices for every gene_map item"""
+        choices = []
+        for map_item in self.gene_map:
+            if self.enforce_ties:
+                choices.append(
+                    [
+                        ((p, t), [lecture, tutorial])
+                        for p, (lecture, tied_tutorials) in enumerate(map_item["pairs"])
+                        for t, tutorial in enumerate(tied_tutorials)
+                    ]
+                )
+            else:
+                choices.append(
+                    [((j,), [section]) for j, section in enumerate(map_item["sections"])]
+                )
+        return choices
+
+    def search_space_size(self) -> int:
+        """Number of distinct timetables the genotype can encode"""
+        return math.prod(len(item_choices) for item_choices in self._choices())
+
+    def solve_exact(self, time_limit: Optional[float] = None) -> Tuple[List[int], float]:
+        """Exhaustive search with clash pruning, fewest-choice items first.
+
+        Partial timetables live in one IncrementalTimetable that is edited in
+        place, so a clash cuts off the whole subtree. Returns the best genes
+        and score (score 0 if nothing is clash-free). With ``time_limit`` the
+        search stops after that many seconds with the best found so far, and
+        ``exact_complete`` records whether the whole tree was covered.
+        """
+        deadline = timer.perf_counter() + time_limit if time_limit is not None else None
+        self.exact_complete = True
+        choices = self._choices()
+        order = sorted(range(len(choices)), key=lambda i: len(choices[i]))
+        genes_per_item = 2 if self.enforce_ties else 1
+        genes = [0] * len(self.gene_upper_bounds)
+        best_genes, best_score = list(genes), 0.0
+        timetable = IncrementalTimetable()
+
+        def search(depth: int):
+            nonlocal best_genes, best_score
+            if not self.exact_complete:
+                return
+            if deadline is not None and timer.perf_counter() > deadline:
+                self.exact_complete = False
+                return
+            if depth == len(order):
+                self.evaluations += 1
+                score = self.score_timetable(timetable)
+                if score > best_score:
+                    best_genes, best_score = list(genes), score
+                return
+            item = order[depth]
+            for item_genes, sections in choices[item]:
+                added = []
+                for section in sections:
+                    if not timetable.can_add_section(section):
+                        break
+                    timetable.add_section(section)
+                    added.append(section)
+                if len(added) == len(sections):
+                    genes[item * genes_per_item : (item + 1) * genes_per_item] = item_genes
+                    search(depth + 1)
+                for section in added:
+                    timetable.remove_section(section)
+
+        search(0)
+        return best_genes, best_score
+
+    def plan_budget(
+        self, target_latency: float = 0.5, model: Optional["BudgetModel"] = None, samples=200
+    ) -> "BudgetPlan":
+        """Measure the problem and split target_latency between the engines.
+
+        The pruned exact search always runs first, up to ``exact_limit``;
+        it settles small or sparse problems (including proving them
+        infeasible) long before a full enumeration would. The limit is a
+        larger share of the budget when few sampled genotypes are
+        clash-free, since the GA rarely finds anything there. run_auto
+        sizes the GA with size_ga only if the exact search hits its limit.
+        """
+        model = model or BudgetModel()
+        started = timer.perf_counter()
+        space = self.search_space_size()
+        n_samples = min(samples, space)
+        feasible = []
+        clash_time = 0.0
+        for _ in range(n_samples):
+            individual = self.toolbox.indices()
+            sample_started = timer.perf_counter()
+            if self.evaluate(individual)[0] > 0:
+                feasible.append(individual)
             else:
-                score -= (consecutive_streak - 2) * STREAK_PENALTY_3_PLUS
+                clash_time += timer.perf_counter() - sample_started
+        density = len(feasible) / n_samples if n_samples else 0.0
+        # Clashing genotypes bail out early and clash-free ones are scored in
+        # full, so the two costs are measured apart and mixed by density.
+        clash_cost = clash_time / max(n_samples - len(feasible), 1)
+        eval_cost = clash_cost
+        if feasible:
+            repeats = max(1, model.cost_samples // len(feasible))
+            timed_started = timer.perf_counter()
+            for individual in feasible * repeats:
+                self.evaluate(individual)
+            feasible_cost = (timer.perf_counter() - timed_started) / (len(feasible) * repeats)
+            eval_cost = density * feasible_cost + (1 - density) * clash_cost
+        sampling_time = timer.perf_counter() - started
+        budget = max(target_latency * model.safety - sampling_time, 0.0)
+        share = model.sparse_exact_share if density < model.sparse_density else model.exact_share
+
+        return BudgetPlan(
+            engine="exact",
+            pop_size=0,
+            generations=0,
+            space_size=space,
+            feasible_density=density,
+            eval_cost=max(eval_cost, 1e-6),
+            sampling_seconds=sampling_time,
+            exact_limit=budget * share,
+            target_seconds=target_latency,
+            cost_scale=model.cost_scale,
+        )
 
-        return (score,)
+    def size_ga(self, plan: "BudgetPlan", model: "BudgetModel", budget: float):
+        """Switch ``plan`` to the GA with a population and generation cap
+        whose predicted evaluation time fits ``budget`` seconds."""
+        eval_cost = plan.eval_cost * model.cost_scale
+        evals = max(budget / eval_cost, 1.0)
+        # Sparse feasible regions need more individuals exploring at once
+        target_generations = 30 if plan.feasible_density < model.sparse_density else 50
+        pop_size = int(evals / (1 + model.changed_fraction * target_generations))
+        pop_size = max(model.min_pop, min(model.max_pop, pop_size))
+        generations = int((evals / pop_size - 1) / model.changed_fraction)
+        generations = max(model.min_generations, min(model.max_generations, generations))
+        plan.engine = "ga"
+        plan.pop_size = pop_size
+        plan.generations = generations
+        plan.ga_predicted_seconds = (
+            plan.eval_cost * pop_size * (1 + model.changed_fraction * generations)
+        )
 
-    # handles finding the best individual from the Hall of Fame and building
-    # the final timetable. You will only need to adjust its decoding logic
-    # when building the final timetable.
+    def run_auto(
+        self,
+        target_latency: float = 0.5,
+        model: Optional["BudgetModel"] = None,
+        log_path: Optional[str] = None,
+        seed: Optional[int] = None,
+        library: Optional["SolutionLibrary"] = None,
+        warm_fraction=0.1,
+    ) -> Optional[Timetable]:
+        """run() within target_latency: the exact search first, then the GA
+        on the remaining budget if the exact search ran out of time. The
+        predicted and actual times are kept in budget_history and appended
+        to ``log_path`` for recalibration. With a ``library`` the GA is
+        seeded as in run() and the result is stored back."""
+        if not self.gene_map:
+            print(
+                "\nError: No sections available for the selected courses. Cannot generate a timetable."
+            )
+            return None
 
-    def run(self, generations=150, pop_size=500) -> Optional[Timetable]:
+        model = model or BudgetModel()
+        self.evaluations = 0
+        self.last_run_stats = None
+        started = timer.perf_counter()
+        plan = self.plan_budget(target_latency, model)
+        exact_started = timer.perf_counter()
+        best_genes, best_score = self.solve_exact(plan.exact_limit)
+        plan.exact_seconds = timer.perf_counter() - exact_started
+        if not self.exact_complete:
+            ga_budget = max(
+                target_latency * model.safety - plan.sampling_seconds - plan.exact_seconds, 0.0
+            )
+            self.size_ga(plan, model, ga_budget)
+            seeds = (
+                library.warm_start(self, int(plan.pop_size * warm_fraction)) if library else []
+            )
+            if seeds:
+                print(f"\nWarm start: seeded {len(seeds)} individuals from the solution library")
+            ga_started = timer.perf_counter()
+            ga_genes, ga_score = self.evolve_array(
+                plan.generations,
+                plan.pop_size,
+                seed=seed,
+                verbose=False,
+                seeds=seeds,
+                time_limit=ga_budget,
+            )
+            plan.ga_actual_seconds = timer.perf_counter() - ga_started
+            if ga_score > best_score:
+                best_genes, best_score = ga_genes, ga_score
+        plan.actual_seconds = timer.perf_counter() - started
+
+        self.budget_history.append(plan)
+        if log_path:
+            plan.append_to_log(log_path)
+        if plan.engine == "exact":
+            engine = "exact engine (search complete)"
+        else:
+            engine = (
+                f"ga engine after the exact search hit its {plan.exact_limit * 1000:.0f} ms limit"
+                f", pop {plan.pop_size} x {plan.generations} generations"
+            )
+        print(
+            f"\nAuto budget: {engine}"
+            f", search space {plan.space_size}, feasible density {plan.feasible_density:.1%}"
+        )
+        print(
+            f"Planned at most {plan.predicted_seconds * 1000:.0f} ms, "
+            f"actual {plan.actual_seconds * 1000:.0f} ms "
+            f"(target {plan.target_seconds * 1000:.0f} ms, {self.evaluations} evaluations)"
+        )
+
+        if best_score == 0:
+            print_no_timetable_found()
+            return None
+        if library is not None:
+            library.record(self, best_genes, best_score)
+        return self.build_timetable(best_genes)
+
+    # handles finding the best individual from the Hall of Fame and building
+    # the final timetable.
+
+    def run(
+        self,
+        generations=150,
+        pop_size=500,
+        local_search=False,
+        local_search_evals=2000,
+        polish_elites=0,
+        elite_evals=200,
+        library: Optional["SolutionLibrary"] = None,
+        warm_fraction=0.1,
+    ) -> Optional[Timetable]:
+        """Run the GA. With ``local_search`` the Hall of Fame winner is polished
+        by hill climbing at the end; ``polish_elites`` also polishes that many
+        of the best individuals in every generation. With a ``library``, up to
+        ``warm_fraction`` of the initial population is seeded from similar
+        past solutions and the result is stored back."""
         if not self.gene_map:
             print(
                 "\nError: No sections available for the selected courses. Cannot generate a timetable."
             )
             return None
 
+        self.evaluations = 0
+        self._score_cache = {}
         pop = self.toolbox.population(n=pop_size)
+        seeds = library.warm_start(self, int(pop_size * warm_fraction)) if library else []
+        for ind, genes in zip(pop, seeds):
+            ind[:] = genes
+        if seeds:
+            print(f"\nWarm start: seeded {len(seeds)} individuals from the solution library")
+
         hof = tools.HallOfFame(1)
         stats = tools.Statistics(lambda ind: ind.fitness.values[0])
         stats.register("avg", np.mean)
         stats.register("max", np.max)
         stats.register("min", np.min)
 
-        algorithms.eaSimple(
+        best_score, best_gen, best_evals = None, 0, 0
+        for gen in self._evolve(
             pop,
-            self.toolbox,
-            cxpb=0.8,
-            mutpb=0.2,
-            ngen=generations,
-            stats=stats,
-            halloffame=hof,
-            verbose=True,
-        )
+            hof,
+            stats,
+            generations,
+            polish_elites=polish_elites,
+            elite_evals=elite_evals,
+        ):
+            if best_score is None or hof[0].fitness.values[0] > best_score:
+                best_score = hof[0].fitness.values[0]
+                best_gen, best_evals = gen, self.evaluations
+        self.last_run_stats = {
+            "engine": "deap",
+            "warm": bool(seeds),
+            "pop_size": pop_size,
+            "generations_to_best": best_gen,
+            "evaluations_to_best": best_evals,
+            "best_score": best_score,
+        }
+
+        if local_search and hof:
+            best = self.toolbox.clone(hof[0])
+            before = best.fitness.values[0]
+            if self._polish(best, local_search_evals):
+                hof.update([best])
+                print(
+                    f"\nLocal search improved best score {before:.1f} -> {best.fitness.values[0]:.1f}"
+                )
+        print(f"Total evaluations: {self.evaluations}")
 
         if not hof or hof[0].fitness.values[0] == 0:
-            print("\n" + "=" * 50)
-            print("COULD NOT FIND A VALID, CLASH-FREE TIMETABLE")
-            print(
-                "This likely means there are unavoidable time clashes between the required sections of your chosen courses, even with all possible combinations."
-            )
-            print("Please try a different combination of courses.")
-            print("=" * 50)
+            print_no_timetable_found()
             return None
 
+        if library is not None:
+            library.record(self, hof[0], hof[0].fitness.values[0])
+
         # Build the best timetable from the best individual
         best_ind = hof[0]
         best_timetable = Timetable()
 
-        # --- Decode the BEST individual to build the final timetable ---
-        # This logic mirrors the decoding in evaluate()
-        sections_to_schedule = []
-        if self.enforce_ties:
-            gene_idx = 0
-            for map_item in self.gene_map:
-                lecture_choice = best_ind[gene_idx]
-                tutorial_choice = best_ind[gene_idx + 1]
-                chosen_pair = map_item["pairs"][lecture_choice]
-                lecture_section = chosen_pair[0]
-                sections_to_schedule.append(lecture_section)
-                tied_tutorials = chosen_pair[1]
-                if tied_tutorials:
-                    safe_tutorial_choice = tutorial_choice % len(tied_tutorials)
-                    tutorial_section = tied_tutorials[safe_tutorial_choice]
-                    sections_to_schedule.append(tutorial_section)
-                gene_idx += 2
-        else:  # Not enforcing ties
-            for i, map_item in enumerate(self.gene_map):
-                choice = best_ind[i]
-                sections_to_schedule.append(map_item["sections"][choice])
-
+        sections_to_schedule = self.decode(best_ind)
         for section in sections_to_schedule:
             best_timetable.add_section(section)
 
         return best_timetable
 
 
+# --- Solution library (warm starts) ---
+
+
+def preference_features(user_preferences: dict) -> List[float]:
+    """Numeric description of a request's preferences for similarity search"""
+    preferred_days = user_preferences.get("preferred_days", DAYS)
+    return (
+        [1.0 if user_preferences.get("schedule_style", "compact") == "spaced_out" else 0.0]
+        + [1.0 if day in preferred_days else 0.0 for day in DAYS]
+        + [
+            time_to_minutes(user_preferences.get("preferred_start", time(8))) / MINUTES_PER_DAY,
+            time_to_minutes(user_preferences.get("preferred_end", time(18))) / MINUTES_PER_DAY,
+            1.0 if user_preferences.get("enforce_ties", True) else 0.0,
+        ]
+    )
+
+
+def _jaccard_distance(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return 1.0 - len(a & b) / len(a | b)
+
+
+class SolutionLibrary:
+    """Past best solutions, looked up by course bundle and preferences.
+
+    Solutions are stored as (course, activity, section) choices rather than
+    raw genes, so they can be mapped onto any new gene_map. Entries are found
+    through an inverted index from course to entries that share it and
+    ranked by bundle overlap first, then preference distance. The library
+    also keeps generations/evaluations-to-best for warm and cold GA runs,
+    tagged with the bundle, engine, population and search-space size, so
+    the saving can be reported between comparable runs. Stored as JSON at
+    ``path``.
+    """
+
+    BUNDLE_WEIGHT = 4.0  # bundle overlap matters more than preference tweaks
+    LECTURER_WEIGHT = 0.5
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = []
+        self.run_stats = {"warm": [], "cold": []}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    data = json.load(file)
+                self.entries = data.get("entries", [])
+                self.run_stats = data.get("run_stats", self.run_stats)
+            except (OSError, ValueError, AttributeError) as e:
+                # A cache file must never stop the scheduler from running
+                print(f"Warning: ignoring unreadable solution library {path}: {e}")
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        self._by_course = defaultdict(list)
+        for i, entry in enumerate(self.entries):
+            for course in entry["courses"]:
+                self._by_course[course].append(i)
+
+    def save(self):
+        """Write to a temporary file and swap it in, so an interrupted save
+        never leaves truncated JSON behind."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"entries": self.entries, "run_stats": self.run_stats}, file)
+        os.replace(tmp_path, self.path)
+
+    def _distance(self, entry: dict, courses: Set[str], features, lecturers: Set[str]) -> float:
+        return (
+            self.BUNDLE_WEIGHT * _jaccard_distance(set(entry["courses"]), courses)
+            + math.dist(entry["features"], features)
+            + self.LECTURER_WEIGHT * _jaccard_distance(set(entry["lecturers"]), lecturers)
+        )
+
+    def nearest(self, user_preferences: dict, k: int = 5) -> List[dict]:
+        """The k stored solutions most similar to this request"""
+        courses = set(user_preferences["courses"])
+        candidates = {i for course in courses for i in self._by_course.get(course, [])}
+        features = preference_features(user_preferences)
+        lecturers = set(user_preferences.get("preferred_lecturers", []))
+        ranked = sorted(
+            candidates,
+            key=lambda i: self._distance(self.entries[i], courses, features, lecturers),
+        )
+        return [self.entries[i] for i in ranked[:k]]
+
+    def warm_start(self, generator: "TimetableGenerator", k: int) -> List[List[int]]:
+        """Genotypes for the new gene_map built from the nearest past solutions"""
+        seeds = []
+        for entry in self.nearest(generator.user_preferences, k):
+            genes, matched = generator.genes_from_sections(
+                [tuple(choice) for choice in entry["sections"]]
+            )
+            if matched:
+                seeds.append(genes)
+        return seeds
+
+    def record(self, generator: "TimetableGenerator", individual: List[int], score: float):
+        """Store a run's best solution and its convergence stats, then save.
+        Exact runs leave last_run_stats unset and add no convergence stats."""
+        prefs = generator.user_preferences
+        entry = {
+            "courses": sorted(prefs["courses"]),
+            "features": preference_features(prefs),
+            "lecturers": sorted(prefs.get("preferred_lecturers", [])),
+            "sections": [list(choice) for choice in generator.chosen_sections(individual)],
+            "score": score,
+        }
+        # Same bundle and preferences: keep only the better solution
+        for i, old in enumerate(self.entries):
+            if (old["courses"], old["features"], old["lecturers"]) == (
+                entry["courses"],
+                entry["features"],
+                entry["lecturers"],
+            ):
+                if entry["score"] > old["score"]:
+                    self.entries[i] = entry
+                break
+        else:
+            self.entries.append(entry)
+            if len(self.entries) > self.max_entries:
+                self.entries = self.entries[-self.max_entries :]
+        self._rebuild_index()
+
+        stats = generator.last_run_stats
+        if stats:
+            self.run_stats["warm" if stats["warm"] else "cold"].append(
+                {
+                    "courses": entry["courses"],
+                    "enforce_ties": generator.enforce_ties,
+                    "engine": stats["engine"],
+                    "pop_size": stats["pop_size"],
+                    "space_size": generator.search_space_size(),
+                    "generations_to_best": stats["generations_to_best"],
+                    "evaluations_to_best": stats["evaluations_to_best"],
+                }
+            )
+        self.save()
+
+    def report(self):
+        """Print how much warm starts save compared to cold starts.
+
+        Only runs of the same bundle, tie mode and engine are compared, and
+        evaluations are divided by the population size so runs with
+        different budgets line up.
+        """
+        print("\n=== Warm Start Report ===")
+        groups = defaultdict(lambda: {"cold": [], "warm": []})
+        for kind in ("cold", "warm"):
+            # Stats saved before runs were tagged cannot be compared
+            runs = [r for r in self.run_stats[kind] if isinstance(r, dict)]
+            print(f"{kind.capitalize()} runs recorded: {len(runs)}")
+            for r in runs:
+                key = (tuple(r["courses"]), r["enforce_ties"], r["engine"])
+                groups[key][kind].append(
+                    (r["generations_to_best"], r["evaluations_to_best"] / r["pop_size"])
+                )
+
+        savings = []
+        for runs in groups.values():
+            if runs["cold"] and runs["warm"]:
+                cold, warm = (
+                    [sum(col) / len(runs[kind]) for col in zip(*runs[kind])]
+                    for kind in ("cold", "warm")
+                )
+                savings.append((cold[0] - warm[0], cold[1] - warm[1]))
+        if not savings:
+            print("No bundle has both warm and cold runs to compare yet.")
+            return
+        print(
+            f"Across {len(savings)} bundle(s) with both warm and cold runs, warm starts save "
+            f"{sum(s[0] for s in savings) / len(savings):.1f} generations and "
+            f"{sum(s[1] for s in savings) / len(savings):.2f} evaluations per individual "
+            f"to the best solution on average"
+        )
+
+
+# --- Time-window index (browse side) ---
+
+
+class SectionWindowIndex:
+    """Per-day sorted interval arrays over the catalog for window queries.
+
+    Classes on each day are kept sorted by start minute next to parallel
+    arrays of end minutes and class ids, so a window lookup is a bisect
+    plus a scan of only the classes that can touch the window.
+    """
+
+    def __init__(self, classes: List[Class]):
+        self.classes = classes
+        self.section_groups = group_classes_by_section(classes)
+        self.section_of = []  # class id -> (course, section_key)
+        self.section_sizes = {}
+        key_of = {}
+        for course, sections in self.section_groups.items():
+            for section_key, section_classes in sections.items():
+                self.section_sizes[(course, section_key)] = len(section_classes)
+                for cls in section_classes:
+                    key_of[id(cls)] = (course, section_key)
+
+        by_day = defaultdict(list)
+        for i, cls in enumerate(classes):
+            self.section_of.append(key_of[id(cls)])
+            by_day[cls.days].append(
+                (time_to_minutes(cls.start_time), time_to_minutes(cls.end_time), i)
+            )
+
+        self.starts = {}
+        self.ends = {}
+        self.ids = {}
+        self.max_duration = {}
+        for day, intervals in by_day.items():
+            intervals.sort()
+            self.starts[day] = [iv[0] for iv in intervals]
+            self.ends[day] = [iv[1] for iv in intervals]
+            self.ids[day] = [iv[2] for iv in intervals]
+            self.max_duration[day] = max(iv[1] - iv[0] for iv in intervals)
+
+    def _contained_ids(self, day: str, start: int, end: int) -> List[int]:
+        if day not in self.starts:
+            return []
+        starts, ends, ids = self.starts[day], self.ends[day], self.ids[day]
+        lo = bisect_left(starts, start)
+        hi = bisect_right(starts, end)
+        return [ids[i] for i in range(lo, hi) if ends[i] <= end]
+
+    def _overlapping_ids(self, day: str, start: int, end: int) -> List[int]:
+        if day not in self.starts:
+            return []
+        starts, ends, ids = self.starts[day], self.ends[day], self.ids[day]
+        # Nothing starting earlier than start - max_duration can still be running
+        lo = bisect_right(starts, start - self.max_duration[day])
+        hi = bisect_left(starts, end)
+        return [ids[i] for i in range(lo, hi) if ends[i] > start]
+
+    def classes_within(self, day: str, start: time, end: time) -> List[Class]:
+        """Classes that fit entirely inside the window"""
+        ids = self._contained_ids(day, time_to_minutes(start), time_to_minutes(end))
+        return [self.classes[i] for i in ids]
+
+    def classes_overlapping(self, day: str, start: time, end: time) -> List[Class]:
+        """Classes that share any time with the window"""
+        ids = self._overlapping_ids(day, time_to_minutes(start), time_to_minutes(end))
+        return [self.classes[i] for i in ids]
+
+    def _candidate_sections(
+        self, courses: Optional[List[str]]
+    ) -> Optional[Set[Tuple[str, str]]]:
+        # None means every section; callers skip the filter instead of copying all keys
+        if courses is None:
+            return None
+        return {
+            (course, section_key)
+            for course in courses
+            for section_key in self.section_groups.get(course, {})
+        }
+
+    def _section_dict(self, keys) -> Dict[Tuple[str, str], List[Class]]:
+        return {key: self.section_groups[key[0]][key[1]] for key in sorted(keys)}
+
+    def sections_within(
+        self,
+        windows: List[Tuple[str, time, time]],
+        courses: Optional[List[str]] = None,
+    ) -> Dict[Tuple[str, str], List[Class]]:
+        """Sections whose every class falls inside one of the (day, start, end) windows."""
+        candidates = self._candidate_sections(courses)
+        contained = set()
+        for day, start, end in windows:
+            contained.update(
+                self._contained_ids(day, time_to_minutes(start), time_to_minutes(end))
+            )
+
+        counts = defaultdict(int)
+        for i in contained:
+            counts[self.section_of[i]] += 1
+        return self._section_dict(
+            key
+            for key, count in counts.items()
+            if count == self.section_sizes[key]
+            and (candidates is None or key in candidates)
+        )
+
+    def clashing_sections(self, timetable: "Timetable") -> Set[Tuple[str, str]]:
+        """Sections with at least one class overlapping the timetable"""
+        clashing = set()
+        for sc in timetable.scheduled_classes:
+            for i in self._overlapping_ids(
+                sc.day, time_to_minutes(sc.start_time), time_to_minutes(sc.end_time)
+            ):
+                clashing.add(self.section_of[i])
+        return clashing
+
+    def sections_compatible_with(
+        self, timetable: "Timetable", courses: Optional[List[str]] = None
+    ) -> Dict[Tuple[str, str], List[Class]]:
+        """Sections that can be added to the timetable without a clash"""
+        candidates = self._candidate_sections(courses)
+        clashing = self.clashing_sections(timetable)
+        return self._section_dict(
+            key
+            for key in (self.section_sizes if candidates is None else candidates)
+            if key not in clashing
+        )
+
+    def sections_fitting(
+        self,
+        windows: List[Tuple[str, time, time]],
+        timetable: "Timetable",
+        courses: Optional[List[str]] = None,
+    ) -> Dict[Tuple[str, str], List[Class]]:
+        """Sections inside the free windows that also do not clash with the timetable"""
+        clashing = self.clashing_sections(timetable)
+        return {
+            key: section
+            for key, section in self.sections_within(windows, courses).items()
+            if key not in clashing
+        }
+
+
+def benchmark_window_index(classes: List[Class], scale: int = 1, n_queries: int = 200):
+    """Compare indexed section lookups against scanning every section.
+
+    The catalog is replicated ``scale`` times (with renamed sections) to
+    simulate larger catalogs.
+    """
+    catalog = [
+        Class(
+            code=cls.code,
+            course=cls.course,
+            activity=cls.activity,
+            section=f"{cls.section}-{copy}" if copy else cls.section,
+            days=cls.days,
+            start_time=cls.start_time,
+            end_time=cls.end_time,
+            venue=cls.venue,
+            tied_to=cls.tied_to,
+            lecturer=cls.lecturer,
+        )
+        for copy in range(scale)
+        for cls in classes
+    ]
+
+    rng = random.Random(0)
+    queries = []
+    for _ in range(n_queries):
+        start_hour = rng.randint(8, 18)
+        queries.append(
+            (rng.choice(DAYS), time(start_hour), time(min(start_hour + 3, 23)))
+        )
+
+    started = timer.perf_counter()
+    index = SectionWindowIndex(catalog)
+    build_time = timer.perf_counter() - started
+
+    started = timer.perf_counter()
+    for window in queries:
+        index.sections_within([window])
+    index_time = timer.perf_counter() - started
+
+    section_groups = index.section_groups
+    started = timer.perf_counter()
+    for day, start, end in queries:
+        [
+            section_key
+            for sections in section_groups.values()
+            for section_key, section in sections.items()
+            if all(
+                cls.days == day and start <= cls.start_time and cls.end_time <= end
+                for cls in section
+            )
+        ]
+    scan_time = timer.perf_counter() - started
+
+    print(f"\n=== Window Index Benchmark ({len(catalog)} classes) ===")
+    print(f"Index build: {build_time * 1000:.1f} ms")
+    print(f"Indexed query: {index_time / n_queries * 1e6:.1f} us")
+    print(f"Full scan query: {scan_time / n_queries * 1e6:.1f} us")
+
+
+# --- What-if feasibility analysis (registrar side) ---
+
+@dataclass
+class CatalogEdit:
+    description: str
+    removed: List[Class]  # classes taken out of the catalog
+    added: List[Class]  # classes put in (e.g. the moved copies)
+
+
+@dataclass
+class EditImpact:
+    edit: CatalogEdit
+    newly_infeasible: List[int]  # indices into the bundle list
+    newly_feasible: List[int]
+
+
+def move_class_edit(cls: Class, day: str, start: time, end: time) -> CatalogEdit:
+    """Edit that moves one class to a new day and time."""
+    moved = Class(
+        code=cls.code,
+        course=cls.course,
+        activity=cls.activity,
+        section=cls.section,
+        days=day,
+        start_time=start,
+        end_time=end,
+        venue=cls.venue,
+        tied_to=cls.tied_to,
+        lecturer=cls.lecturer,
+    )
+    return CatalogEdit(
+        description=f"Move {cls.code} {cls.activity} {cls.section} to {day} "
+        f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')}",
+        removed=[cls],
+        added=[moved],
+    )
+
+
+def cancel_section_edit(section_classes: List[Class]) -> CatalogEdit:
+    """Edit that cancels every class of a section."""
+    first = section_classes[0]
+    return CatalogEdit(
+        description=f"Cancel {first.code} {first.activity} {first.section}",
+        removed=list(section_classes),
+        added=[],
+    )
+
+
+def _occupancy_mask(section_classes: List[Class]) -> int:
+    """Bitmask of the minutes of the week a group of classes occupies."""
+    mask = 0
+    for cls in section_classes:
+        start = time_to_minutes(cls.start_time)
+        end = time_to_minutes(cls.end_time)
+        if cls.days not in DAYS:
+            continue  # not on a weekday grid, so it cannot clash with weekday classes
+        offset = DAYS.index(cls.days) * MINUTES_PER_DAY
+        mask |= ((1 << (end - start)) - 1) << (offset + start)
+    return mask
+
+
+class FeasibilityAnalyzer:
+    """Clash-free feasibility checks for many course bundles at once.
+
+    Each course becomes one or more choice variables whose options are
+    occupancy bitmasks, built from the same gene map TimetableGenerator
+    uses: with ties enforced an option is a lecture plus one of its tied
+    tutorials, and lectures without tied tutorials are not offered; without
+    ties lectures and tutorials are separate variables. Like the generator,
+    a course the catalog has nothing to offer for is left out of the bundle
+    rather than making it infeasible, and a bundle left with no courses at
+    all is infeasible. A course that an edit empties (e.g. by cancelling
+    its only lecture section) does make the bundle infeasible. Two options clash exactly when their masks intersect, so
+    the search is a DFS over masks with no scoring.
+    """
+
+    def __init__(self, classes: List[Class], enforce_ties: bool = True):
+        self.enforce_ties = enforce_ties
+        self.course_classes = defaultdict(list)
+        for cls in classes:
+            self.course_classes[cls.course].append(cls)
+        self._variables = {}
+        self._solutions = {}
+
+    def _build_variables(self, course_classes: List[Class]) -> List[List[Tuple[int, tuple]]]:
+        """Choice variables for one course; each option is (mask, class ids)."""
+        sections = defaultdict(list)
+        for cls in course_classes:
+            sections[f"{cls.activity}_{cls.section}"].append(cls)
+
+        def option(groups):
+            members = [cls for group in groups for cls in group]
+            mask = 0
+            for group in groups:
+                group_mask = _occupancy_mask(group)
+                if mask & group_mask:
+                    return None  # lecture and its tutorial clash with each other
+                mask |= group_mask
+            return mask, tuple(sorted(id(cls) for cls in members))
+
+        lectures = [sc for sk, sc in sorted(sections.items()) if sk.startswith("Lecture")]
+        tutorials = [sc for sk, sc in sorted(sections.items()) if sk.startswith("Tutorial")]
+
+        if self.enforce_ties:
+            options = []
+            has_pairs = False
+            for lecture in lectures:
+                tied = [
+                    sections[f"Tutorial_{name}"]
+                    for name in lecture[0].tied_to
+                    if f"Tutorial_{name}" in sections
+                ]
+                has_pairs = has_pairs or bool(tied)
+                for tut in tied:
+                    opt = option([lecture, tut])
+                    if opt is not None:
+                        options.append(opt)
+            # No tied pairs at all: the generator drops the course from its gene map
+            return [options] if has_pairs else []
+
+        variables = []
+        for groups in (lectures, tutorials):
+            if groups:
+                variables.append([option([group]) for group in groups])
+        return variables
+
+    def variables_for(self, course: str, overrides: Optional[Dict] = None):
+        if overrides and course in overrides:
+            return overrides[course]
+        if course not in self._variables:
+            self._variables[course] = self._build_variables(self.course_classes.get(course, []))
+        return self._variables[course]
+
+    def solve(self, courses, overrides: Optional[Dict] = None) -> Optional[List[tuple]]:
+        """Return one clash-free (course, mask, ids) option per variable, or None."""
+        if overrides and any(
+            len(overrides[course]) < len(self.variables_for(course))
+            for course in courses
+            if course in overrides
+        ):
+            return None  # the edit took away all of a course's lectures or tutorials
+        variables = [
+            (course, options)
+            for course in courses
+            for options in self.variables_for(course, overrides)
+        ]
+        if not variables or any(not options for _, options in variables):
+            return None
+        variables.sort(key=lambda var: len(var[1]))  # fewest options first
+
+        chosen = []
+
+        def search(depth: int, occupied: int) -> bool:
+            if depth == len(variables):
+                return True
+            course, options = variables[depth]
+            for mask, ids in options:
+                if not mask & occupied:
+                    chosen.append((course, mask, ids))
+                    if search(depth + 1, occupied | mask):
+                        return True
+                    chosen.pop()
+            return False
+
+        return chosen if search(0, 0) else None
+
+    def baseline_solution(self, courses) -> Optional[List[tuple]]:
+        key = frozenset(courses)
+        if key not in self._solutions:
+            self._solutions[key] = self.solve(key)
+        return self._solutions[key]
+
+    def _overrides_for(self, edit: CatalogEdit) -> Dict[str, list]:
+        removed = {id(cls) for cls in edit.removed}
+        overrides = {}
+        for course in {cls.course for cls in edit.removed + edit.added}:
+            edited = [cls for cls in self.course_classes.get(course, []) if id(cls) not in removed]
+            edited += [cls for cls in edit.added if cls.course == course]
+            overrides[course] = self._build_variables(edited)
+        return overrides
+
+    def analyze(self, bundles: List[List[str]], edits: List[CatalogEdit]) -> List[EditImpact]:
+        """For every edit, list the bundles that lose (or gain) a clash-free timetable."""
+        by_course = defaultdict(list)
+        unique_bundles = defaultdict(list)  # frozenset -> bundle indices
+        for i, bundle in enumerate(bundles):
+            unique_bundles[frozenset(bundle)].append(i)
+        for key in unique_bundles:
+            for course in key:
+                by_course[course].append(key)
+
+        impacts = []
+        for edit in edits:
+            overrides = self._overrides_for(edit)
+            surviving = {
+                course: {ids for options in variables for _, ids in options}
+                for course, variables in overrides.items()
+            }
+            touched = {key for course in overrides for key in by_course[course]}
+            newly_infeasible, newly_feasible = [], []
+            for key in touched:
+                before = self.baseline_solution(key)
+                if before is not None:
+                    # Still feasible if every option the old solution used survives the edit
+                    if all(
+                        ids in surviving[course]
+                        for course, _, ids in before
+                        if course in overrides
+                    ):
+                        continue
+                    if self.solve(key, overrides) is None:
+                        newly_infeasible.extend(unique_bundles[key])
+                elif self.solve(key, overrides) is not None:
+                    newly_feasible.extend(unique_bundles[key])
+            impacts.append(
+                EditImpact(
+                    edit=edit,
+                    newly_infeasible=sorted(newly_infeasible),
+                    newly_feasible=sorted(newly_feasible),
+                )
+            )
+        return impacts
+
+
+def analyze_catalog_edits(
+    classes: List[Class],
+    bundles: List[List[str]],
+    edits: List[CatalogEdit],
+    enforce_ties: bool = True,
+) -> List[EditImpact]:
+    """Entry point: which course bundles each proposed edit would break."""
+    return FeasibilityAnalyzer(classes, enforce_ties).analyze(bundles, edits)
+
+
+def print_edit_impacts(impacts: List[EditImpact], bundles: List[List[str]]):
+    """Print the what-if report for the registrar"""
+    print("\n=== Catalog Change Impact ===")
+    print(
+        "(feasible = the scheduler finds a clash-free timetable; courses the catalog "
+        "never had schedulable sections for are skipped, as in the scheduler, but a "
+        "course an edit empties makes the bundle infeasible)"
+    )
+    for impact in impacts:
+        print(f"\n{impact.edit.description}:")
+        print(f"  Bundles left without a clash-free timetable: {len(impact.newly_infeasible)}")
+        for i in impact.newly_infeasible[:10]:
+            print(f"    - {', '.join(sorted(bundles[i]))}")
+        if len(impact.newly_infeasible) > 10:
+            print(f"    ... and {len(impact.newly_infeasible) - 10} more")
+        if impact.newly_feasible:
+            print(f"  Bundles that become schedulable: {len(impact.newly_feasible)}")
+
+
+# --- Catalog audit (admin side) ---
+
+
+@dataclass
+class BookingConflict:
+    resource_type: str  # "venue" or "lecturer"
+    resource: str
+    day: str
+    first: Class
+    second: Class
+
+
+def _sweep_overlaps(intervals: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """Report every overlapping pair in one resource/day bucket.
+
+    Intervals are (start, end, id) tuples. They are swept in start order while
+    a heap keeps the ones still running, so the cost is O(n log n) plus the
+    number of pairs reported.
+    """
+    intervals.sort()
+    active = []  # heap of (end, id)
+    pairs = []
+    for start, end, ident in intervals:
+        # Anything that ended at or before this start cannot clash any more
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, other in active:
+            pairs.append((other, ident))
+        heapq.heappush(active, (end, ident))
+    return pairs
+
+
+def find_double_bookings(classes: List[Class]) -> List[BookingConflict]:
+    """Find every venue and lecturer that is booked twice at the same time."""
+    by_venue = defaultdict(list)
+    by_lecturer = defaultdict(list)
+    for i, cls in enumerate(classes):
+        interval = (time_to_minutes(cls.start_time), time_to_minutes(cls.end_time), i)
+        if cls.venue:
+            by_venue[(cls.venue, cls.days)].append(interval)
+        if cls.lecturer and cls.lecturer != "Not Assigned":
+            by_lecturer[(cls.lecturer, cls.days)].append(interval)
+
+    day_order = {day: i for i, day in enumerate(DAYS)}
+    conflicts = []
+    for resource_type, index in (("venue", by_venue), ("lecturer", by_lecturer)):
+        for resource, day in sorted(
+            index, key=lambda k: (k[0], day_order.get(k[1], len(DAYS)))
+        ):
+            intervals = index[(resource, day)]
+            if len(intervals) < 2:
+                continue
+            for first, second in _sweep_overlaps(intervals):
+                conflicts.append(
+                    BookingConflict(
+                        resource_type=resource_type,
+                        resource=resource,
+                        day=day,
+                        first=classes[first],
+                        second=classes[second],
+                    )
+                )
+    return conflicts
+
+
+def print_double_bookings(conflicts: List[BookingConflict]):
+    """Print the catalog audit grouped by venue and lecturer"""
+    print("\n=== Catalog Double-Booking Audit ===")
+    if not conflicts:
+        print("No venue or lecturer is double-booked.")
+        return
+
+    for resource_type in ("venue", "lecturer"):
+        of_type = [c for c in conflicts if c.resource_type == resource_type]
+        if not of_type:
+            continue
+        print(f"\n{resource_type.capitalize()} clashes ({len(of_type)}):")
+        for c in of_type:
+            print(
+                f"  {c.resource} on {c.day}: "
+                f"{c.first.code} {c.first.activity} {c.first.section} "
+                f"({c.first.start_time.strftime('%H:%M')}-{c.first.end_time.strftime('%H:%M')}) vs "
+                f"{c.second.code} {c.second.activity} {c.second.section} "
+                f"({c.second.start_time.strftime('%H:%M')}-{c.second.end_time.strftime('%H:%M')})"
+            )
+
+
+def audit_catalog(filename: str = "classes.csv"):
+    """Entry point for admins: check an uploaded catalog for double-bookings."""
+    classes = load_classes_from_csv(filename)
+    if not classes:
+        print(f"Could not load any classes from {filename}.")
+        return
+    print(f"Loaded {len(classes)} classes from {filename}")
+    print_double_bookings(find_double_bookings(classes))
+
+
+# --- SQLite catalog store (local stand-in for the Supabase tables) ---
+
+# Same tables and columns as supabase/migrations for the catalog side.
+# Postgres enums become TEXT with CHECK constraints and UUIDs are stored as
+# text. profiles has no auth.users foreign key here, and email is nullable
+# because a CSV import only knows lecturer names.
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subjects (
+    id TEXT PRIMARY KEY,
+    code VARCHAR(20) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    credits INTEGER NOT NULL DEFAULT 3,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS venues (
+    id TEXT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    building VARCHAR(100),
+    floor INTEGER,
+    capacity INTEGER NOT NULL DEFAULT 50,
+    type VARCHAR(50) DEFAULT 'classroom',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    email VARCHAR(255) UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    role TEXT NOT NULL DEFAULT 'student' CHECK (role IN ('student', 'lecturer', 'admin')),
+    department VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS sections (
+    id TEXT PRIMARY KEY,
+    subject_id TEXT NOT NULL REFERENCES subjects(id) ON DELETE CASCADE,
+    section_number VARCHAR(10) NOT NULL,
+    lecturer_id TEXT REFERENCES profiles(id),
+    max_students INTEGER NOT NULL DEFAULT 50,
+    enrolled_students INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(subject_id, section_number)
+);
+
+CREATE TABLE IF NOT EXISTS classes (
+    id TEXT PRIMARY KEY,
+    section_id TEXT NOT NULL REFERENCES sections(id) ON DELETE CASCADE,
+    activity_type TEXT NOT NULL CHECK (activity_type IN ('lecture', 'tutorial', 'lab', 'seminar')),
+    day_of_week TEXT NOT NULL CHECK (day_of_week IN
+        ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')),
+    start_time TIME NOT NULL,
+    end_time TIME NOT NULL,
+    venue_id TEXT REFERENCES venues(id),
+    tied_to TEXT REFERENCES classes(id), -- For tutorials tied to lectures
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_subjects_name ON subjects(name);
+CREATE INDEX IF NOT EXISTS idx_classes_section ON classes(section_id);
+CREATE INDEX IF NOT EXISTS idx_classes_tied_to ON classes(tied_to);
+CREATE INDEX IF NOT EXISTS idx_venues_name ON venues(name);
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles(name);
+"""
+
+# One row per class with everything needed to build a Class. The subject
+# filter is appended per query; lecture ties are rebuilt from the
+# tutorials that point at them.
+CATALOG_SELECT = """
+SELECT c.id, s.code, s.name, c.activity_type, sec.section_number, c.day_of_week,
+       c.start_time, c.end_time, v.name, p.name, c.tied_to, tied_sec.section_number
+FROM subjects s
+JOIN sections sec ON sec.subject_id = s.id
+JOIN classes c ON c.section_id = sec.id
+LEFT JOIN venues v ON v.id = c.venue_id
+LEFT JOIN profiles p ON p.id = sec.lecturer_id
+LEFT JOIN classes tied ON tied.id = c.tied_to
+LEFT JOIN sections tied_sec ON tied_sec.id = tied.section_id
+"""
+
+QUERY_CHUNK = 100  # parameters per IN (...) list
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of connections to one database file, reused across
+    requests so batch and service callers skip the connect cost."""
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self._pool = queue.Queue(maxsize=size)
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._pool.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class SQLiteCatalog:
+    """Catalog backend reading the Supabase schema from a local SQLite file."""
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.pool = SQLiteConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(CATALOG_SCHEMA)
+
+    def close(self):
+        self.pool.close()
+
+    def _fetch(self, column: str, values: List[str]) -> List[tuple]:
+        """Run CATALOG_SELECT filtered on ``column IN (...)`` in fixed-size
+        chunks. Short chunks are padded so every query uses the same SQL text
+        and hits sqlite3's prepared-statement cache."""
+        sql = f"{CATALOG_SELECT} WHERE {column} IN ({', '.join('?' * QUERY_CHUNK)})"
+        rows = []
+        values = list(dict.fromkeys(values))
+        with self.pool.connection() as conn:
+            for i in range(0, len(values), QUERY_CHUNK):
+                chunk = values[i : i + QUERY_CHUNK]
+                chunk += [chunk[-1]] * (QUERY_CHUNK - len(chunk))
+                rows.extend(conn.execute(sql, chunk))
+        return rows
+
+    def _rows_to_classes(self, rows: List[tuple]) -> List[Class]:
+        # Lectures list the sections of the tutorials tied to them
+        tied_tutorials = defaultdict(list)
+        for row in rows:
+            tied_to_id, tied_section = row[10], row[11]
+            if tied_to_id and row[4] not in tied_tutorials[tied_to_id]:
+                tied_tutorials[tied_to_id].append(row[4])
+
+        lecture_ties = {}  # (code, section) -> tutorial sections
+        for row in rows:
+            for tutorial in tied_tutorials.get(row[0], []):
+                ties = lecture_ties.setdefault((row[1], row[4]), [])
+                if tutorial not in ties:
+                    ties.append(tutorial)
+
+        classes = []
+        for (
+            _,
+            code,
+            name,
+            activity,
+            section,
+            day,
+            start,
+            end,
+            venue,
+            lecturer,
+            _,
+            tied_section,
+        ) in rows:
+            classes.append(
+                Class(
+                    code=code,
+                    course=name,
+                    activity=activity.capitalize(),
+                    section=section,
+                    days=day.capitalize(),
+                    start_time=time.fromisoformat(start),
+                    end_time=time.fromisoformat(end),
+                    venue=venue or "",
+                    tied_to=[tied_section]
+                    if tied_section
+                    else sorted(lecture_ties.get((code, section), [])),
+                    lecturer=lecturer or "Not Assigned",
+                )
+            )
+        return classes
+
+    def load_classes(self, subject_codes: Optional[List[str]] = None) -> List[Class]:
+        """Load classes for the given subject codes (or the whole catalog)."""
+        if subject_codes is None:
+            with self.pool.connection() as conn:
+                rows = conn.execute(CATALOG_SELECT).fetchall()
+        else:
+            rows = self._fetch("s.code", subject_codes)
+        return self._rows_to_classes(rows)
+
+    def load_courses(self, course_names: List[str]) -> List[Class]:
+        """Load classes for the given course names, as used in user preferences."""
+        return self._rows_to_classes(self._fetch("s.name", course_names))
+
+    def course_names(self) -> List[str]:
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT name FROM subjects ORDER BY name")]
+
+    def import_classes(self, classes: List[Class]) -> int:
+        """Bulk insert classes in one transaction, reusing existing subjects,
+        venues, lecturers and sections and skipping classes already stored.
+        Returns the number of classes added."""
+        with self.pool.connection() as conn:
+            subject_ids = dict(conn.execute("SELECT code, id FROM subjects"))
+            venue_ids = dict(conn.execute("SELECT name, id FROM venues"))
+            lecturer_ids = dict(
+                conn.execute("SELECT name, id FROM profiles WHERE role = 'lecturer'")
+            )
+            section_ids = {
+                (code, number): sid
+                for code, number, sid in conn.execute(
+                    "SELECT s.code, sec.section_number, sec.id FROM sections sec "
+                    "JOIN subjects s ON s.id = sec.subject_id"
+                )
+            }
+            existing = {
+                tuple(slot): class_id
+                for class_id, *slot in conn.execute(
+                    "SELECT id, section_id, activity_type, day_of_week, start_time, end_time "
+                    "FROM classes"
+                )
+            }
+
+            new_subjects, new_venues, new_lecturers, new_sections = [], [], [], []
+            new_classes = []
+            lecture_ids = {}  # (code, section) -> a lecture class id, new or stored
+            for cls in classes:
+                if cls.code not in subject_ids:
+                    subject_ids[cls.code] = str(uuid.uuid4())
+                    new_subjects.append((subject_ids[cls.code], cls.code, cls.course))
+                if cls.venue and cls.venue not in venue_ids:
+                    venue_ids[cls.venue] = str(uuid.uuid4())
+                    new_venues.append((venue_ids[cls.venue], cls.venue))
+                lecturer_id = None
+                if cls.lecturer != "Not Assigned":
+                    if cls.lecturer not in lecturer_ids:
+                        lecturer_ids[cls.lecturer] = str(uuid.uuid4())
+                        new_lecturers.append((lecturer_ids[cls.lecturer], cls.lecturer))
+                    lecturer_id = lecturer_ids[cls.lecturer]
+                key = (cls.code, cls.section)
+                if key not in section_ids:
+                    section_ids[key] = str(uuid.uuid4())
+                    new_sections.append(
+                        (section_ids[key], subject_ids[cls.code], cls.section, lecturer_id)
+                    )
+                slot = (
+                    section_ids[key],
+                    cls.activity.lower(),
+                    cls.days.lower(),
+                    cls.start_time.isoformat(),
+                    cls.end_time.isoformat(),
+                )
+                if slot in existing:
+                    class_id = existing[slot]  # already imported
+                else:
+                    class_id = str(uuid.uuid4())
+                    existing[slot] = class_id
+                    new_classes.append(
+                        [class_id, *slot, venue_ids.get(cls.venue), None, cls]
+                    )
+                if cls.activity == "Lecture":
+                    lecture_ids.setdefault(key, class_id)
+
+            # classes.tied_to holds one lecture per tutorial. Only the lecture
+            # side counts, as in load_classes_from_csv, so a round trip offers
+            # the same pairs; ties listed only by the tutorial are reported.
+            # Every lecture in the input counts, including ones already stored,
+            # so new tutorials can tie to lectures from an earlier import.
+            lecture_for = {}
+            for cls in classes:
+                if cls.activity == "Lecture":
+                    for tutorial in cls.tied_to:
+                        lecture_for.setdefault((cls.code, tutorial), []).append(cls.section)
+            inconsistent = set()
+            for row in new_classes:
+                cls = row[8]
+                if cls.activity != "Tutorial":
+                    continue
+                lectures = list(dict.fromkeys(lecture_for.get((cls.code, cls.section), [])))
+                if lectures:
+                    row[7] = lecture_ids[(cls.code, lectures[0])]
+                    if len(lectures) > 1:
+                        inconsistent.add(
+                            f"{cls.code} tutorial {cls.section} is tied to lectures "
+                            f"{', '.join(lectures)}; only {lectures[0]} is stored"
+                        )
+                for lecture in cls.tied_to:
+                    if lecture not in lectures:
+                        inconsistent.add(
+                            f"{cls.code} tutorial {cls.section} lists {lecture}, "
+                            f"but no lecture {lecture} lists it; ignored"
+                        )
+            for message in sorted(inconsistent):
+                print(f"Inconsistent tie: {message}")
+
+            with conn:
+                conn.executemany(
+                    "INSERT INTO subjects (id, code, name) VALUES (?, ?, ?)", new_subjects
+                )
+                conn.executemany("INSERT INTO venues (id, name) VALUES (?, ?)", new_venues)
+                conn.executemany(
+                    "INSERT INTO profiles (id, name, role) VALUES (?, ?, 'lecturer')",
+                    new_lecturers,
+                )
+                conn.executemany(
+                    "INSERT INTO sections (id, subject_id, section_number, lecturer_id) "
+                    "VALUES (?, ?, ?, ?)",
+                    new_sections,
+                )
+                # Lectures first so tutorial ties can reference them
+                new_classes.sort(key=lambda row: row[7] is not None)
+                conn.executemany(
+                    "INSERT INTO classes (id, section_id, activity_type, day_of_week, "
+                    "start_time, end_time, venue_id, tied_to) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row[:8] for row in new_classes],
+                )
+        return len(new_classes)
+
+    def import_csv(self, filename: str) -> int:
+        """Bulk import a CSV in the format load_classes_from_csv reads."""
+        return self.import_classes(load_classes_from_csv(filename))
+
+
 # In tt.py, replace your existing get_user_preferences function with this one.
 
 
-def get_user_preferences(classes: List[Class]) -> dict:
-    """Get user preferences, including courses, days, times, ties, and lecturers."""
-    # --- Get Course Selection (Existing logic) ---
-    all_courses = sorted({cls.course for cls in classes})
+def select_courses(all_courses: List[str]) -> List[str]:
+    """Ask the user to pick courses from the menu."""
     print("\nAvailable Courses:")
     for i, course in enumerate(all_courses, 1):
         print(f"{i}. {course}")
@@ -581,6 +2600,21 @@ def get_user_preferences(classes: List[Class]) -> dict:
             break
         except (ValueError, IndexError):
             print("Invalid selection. Please enter numbers from the list.")
+    return selected_courses
+
+
+def get_user_preferences(
+    classes: List[Class], selected_courses: Optional[List[str]] = None
+) -> dict:
+    """Get user preferences, including courses, days, times, ties, and lecturers.
+
+    Pass ``selected_courses`` when the courses were already chosen (e.g. from
+    the database menu before loading their classes); lecturers are then
+    offered from ``classes``.
+    """
+    # --- Get Course Selection (Existing logic) ---
+    if selected_courses is None:
+        selected_courses = select_courses(sorted({cls.course for cls in classes}))
 
     # --- Get Day/Time Preferences (Existing logic) ---
     print("\nAvailable Days:", DAYS)
@@ -780,21 +2814,40 @@ def print_lecturer_summary(timetable: Timetable, user_prefs: dict):
         )
 
 
-def main():
+def main(db_path: Optional[str] = None):
     print("=== University Timetable Generator ===")
-    classes = load_classes_from_csv("classes.csv")
+    selected_courses = None
+    if db_path:
+        # Only the chosen courses' sections are fetched from the database
+        catalog = SQLiteCatalog(db_path, pool_size=1)
+        all_courses = catalog.course_names()
+        if all_courses:
+            selected_courses = select_courses(all_courses)
+            classes = catalog.load_courses(selected_courses)
+        else:
+            classes = []
+        catalog.close()
+        source = db_path
+    else:
+        classes = load_classes_from_csv("classes.csv")
+        source = "classes.csv"
     if not classes:
-        print("Could not load any classes from classes.csv. Exiting.")
+        print(f"Could not load any classes from {source}. Exiting.")
         return
 
-    print(f"Loaded {len(classes)} classes from CSV")
+    print(f"Loaded {len(classes)} classes from {source}")
 
-    user_prefs = get_user_preferences(classes)
+    user_prefs = get_user_preferences(classes, selected_courses)
 
     print("\nGenerating timetable based on your preferences...")
     try:
         generator = TimetableGenerator(classes, user_prefs)
-        best_timetable = generator.run(generations=150, pop_size=500)
+        best_timetable = generator.run_auto(
+            target_latency=0.5,
+            model=BudgetModel.from_log(BUDGET_LOG),
+            log_path=BUDGET_LOG,
+            library=SolutionLibrary(SOLUTION_LIBRARY),
+        )
 
         # ### CHANGED ###: Handle the case where no timetable is returned
         if best_timetable:
@@ -872,4 +2925,19 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "audit":
+        audit_catalog(sys.argv[2] if len(sys.argv) > 2 else "classes.csv")
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-index":
+        benchmark_window_index(
+            load_classes_from_csv("classes.csv"),
+            scale=int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+        )
+    elif len(sys.argv) > 2 and sys.argv[1] == "import-db":
+        catalog = SQLiteCatalog(sys.argv[2], pool_size=1)
+        csv_file = sys.argv[3] if len(sys.argv) > 3 else "classes.csv"
+        print(f"Imported {catalog.import_csv(csv_file)} classes from {csv_file} into {sys.argv[2]}")
+        catalog.close()
+    elif len(sys.argv) > 2 and sys.argv[1] == "--db":
+        main(sys.argv[2])
+    else:
+        main()